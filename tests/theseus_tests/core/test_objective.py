@@ -3,6 +3,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import warnings
+
 import numpy as np
 import pytest  # noqa: F401
 import torch
@@ -239,6 +241,64 @@ def test_add_and_erase_step_by_step():
     assert cw2 not in objective.cost_functions_for_weights
 
 
+def test_erase_function_with_repeated_var():
+    var1 = MockVar(1, tensor=None, name="var1")
+    aux1 = MockVar(1, tensor=None, name="aux1")
+    cw = MockCostWeight(MockVar(1, tensor=None, name="cw_aux"), name="cw")
+    cf1 = MockCostFunction([var1], [aux1, aux1], cw, name="cf1")
+    cf2 = MockCostFunction([var1], [aux1], cw, name="cf2")
+
+    objective = th.Objective()
+    objective.add(cf1)
+    objective.add(cf2)
+
+    objective.erase("cf1")
+    assert list(objective.functions_for_aux_vars[aux1]) == [cf2]
+    assert "aux1" in objective.aux_vars
+
+    objective.erase("cf2")
+    assert aux1 not in objective.functions_for_aux_vars
+    assert "aux1" not in objective.aux_vars
+
+
+def test_dim_after_add_and_erase():
+    objective, cost_functions, names, *_ = create_objective_with_mock_cost_functions()
+    expected_dim = sum(cf.dim() for cf in cost_functions)
+    assert objective.dim() == expected_dim
+    assert objective.dim() == expected_dim  # served from cache
+
+    objective.erase(names[0])
+    expected_dim -= cost_functions[0].dim()
+    assert objective.dim() == expected_dim
+
+    objective.add(cost_functions[0])
+    expected_dim += cost_functions[0].dim()
+    assert objective.dim() == expected_dim
+
+
+def test_add_checks_dtype_of_known_vars():
+    # variable whose functions were all erased
+    v1 = th.Vector(tensor=torch.ones(1, 2), name="v1")
+    z = th.Vector(tensor=torch.zeros(1, 2), name="z")
+    cost_function = th.Difference(v1, z, th.ScaleCostWeight(1.0), name="d1")
+    objective = th.Objective()
+    objective.add(cost_function)
+    objective.erase("d1")
+
+    v1.to(dtype=torch.float64)
+    with pytest.raises(ValueError, match="dtype"):
+        objective.add(cost_function)
+
+    # variable still connected to another function
+    v1 = th.Vector(tensor=torch.ones(1, 2), name="v1")
+    objective = th.Objective()
+    objective.add(th.Difference(v1, z, th.ScaleCostWeight(1.0), name="d1"))
+
+    v1.to(dtype=torch.float64)
+    with pytest.raises(ValueError, match="dtype"):
+        objective.add(th.Difference(v1, z, th.ScaleCostWeight(1.0), name="d2"))
+
+
 def test_objective_error():
     def _check_error_for_data(v1_data_, v2_data_, error_, error_type):
         expected_error = torch.cat([v1_data_, v2_data_], dim=1) * w
@@ -367,6 +427,64 @@ def test_objective_error():
         )
 
 
+def test_objective_error_inference_mode():
+    v1 = th.Vector(tensor=torch.ones(2, 3), name="v1")
+    z = th.Vector(tensor=torch.zeros(2, 3), name="z")
+    objective = th.Objective()
+    objective.add(th.Difference(v1, z, th.ScaleCostWeight(1.0), name="d1"))
+
+    with torch.inference_mode():
+        torch.testing.assert_close(objective.error(), torch.ones(2, 3))
+        torch.testing.assert_close(objective.error_metric(), 1.5 * torch.ones(2))
+        # variables holding inference tensors
+        objective.update({"v1": 2.0 * torch.ones(2, 3)})
+        torch.testing.assert_close(objective.error(), 2.0 * torch.ones(2, 3))
+        torch.testing.assert_close(objective.error_metric(), 6.0 * torch.ones(2))
+
+    # variables holding inference tensors outside of inference mode
+    with torch.no_grad():
+        torch.testing.assert_close(objective.error(), 2.0 * torch.ones(2, 3))
+        torch.testing.assert_close(objective.error_metric(), 6.0 * torch.ones(2))
+
+
+def test_error_and_metric():
+    v1 = th.Vector(tensor=torch.randn(2, 3), name="v1")
+    z = th.Vector(tensor=torch.zeros(2, 3), name="z")
+    objective = th.Objective()
+    objective.add(th.Difference(v1, z, th.ScaleCostWeight(2.0), name="d1"))
+
+    input_tensors = {"v1": torch.randn(2, 3)}
+    for also_update in [False, True]:
+        error, metric = objective.error_and_metric(
+            input_tensors=input_tensors, also_update=also_update
+        )
+        torch.testing.assert_close(error, 2.0 * input_tensors["v1"])
+        torch.testing.assert_close(
+            metric, objective.error_metric(input_tensors=input_tensors)
+        )
+        assert (v1.tensor is input_tensors["v1"]) == also_update
+
+
+def test_error_metric_fails_like_error():
+    # no cost functions
+    objective = th.Objective()
+    with pytest.raises(RuntimeError):
+        objective.error()
+    with pytest.raises(RuntimeError):
+        objective.error_metric()
+
+    # cost functions with errors of different batch sizes
+    v1 = th.Vector(tensor=torch.ones(2, 3), name="v1")
+    v2 = th.Vector(tensor=torch.ones(1, 3), name="v2")
+    z = th.Vector(tensor=torch.zeros(1, 3), name="z")
+    objective.add(th.Difference(v1, z, th.ScaleCostWeight(1.0), name="d1"))
+    objective.add(th.Difference(v2, z, th.ScaleCostWeight(1.0), name="d2"))
+    with pytest.raises(RuntimeError):
+        objective.error()
+    with pytest.raises(RuntimeError):
+        objective.error_metric()
+
+
 def test_get_cost_functions_connected_to_vars():
     (
         objective,
@@ -481,6 +599,20 @@ def test_update_updates_properly():
         assert data is var_.tensor
 
 
+def test_update_warns_once_per_unknown_name():
+    objective, *_ = create_objective_with_mock_cost_functions(
+        torch.ones(1, 1),
+        MockCostWeight(th.Variable(torch.ones(1), name="cost_weight_aux")),
+    )
+    with pytest.warns(UserWarning, match="not associated to any variable"):
+        objective.update({"unknown": torch.ones(1, 1)})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        objective.update({"unknown": torch.ones(1, 1)})
+    with pytest.warns(UserWarning, match="not associated to any variable"):
+        objective.update({"another_unknown": torch.ones(1, 1)})
+
+
 def test_update_raises_batch_size_error():
     (
         objective,
@@ -537,6 +669,11 @@ def test_iterator():
         assert f == cost_functions[idx]
         idx += 1
 
+    # cost functions can be erased while iterating
+    for f in objective:
+        objective.erase(f.name)
+    assert not objective.cost_functions
+
 
 def test_to_dtype():
     objective, *_ = create_objective_with_mock_cost_functions()
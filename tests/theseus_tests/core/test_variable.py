@@ -30,6 +30,10 @@ def test_variable_init():
 
     assert len(set(all_ids)) == len(all_ids)
 
+    # str subclasses are accepted as names
+    t = th.Variable(torch.rand(1, 1), name=np.str_("np_name"))
+    assert t.name == "np_name"
+
 
 def test_properties():
     for i in range(100):
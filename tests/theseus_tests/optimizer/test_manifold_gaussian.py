@@ -197,3 +197,20 @@ def test_retract_gaussian():
 
         gaussian = th.retract_gaussian(variable, mean_tp, lam_tp)
         assert torch.allclose(gaussian.mean[0].tensor, variable.retract(mean_tp).tensor)
+
+        # check precision against the explicit inverse formula, for a random
+        # SPD precision (in double, to avoid spurious symmetry check failures)
+        variable_d = variable.copy()
+        variable_d.to(dtype=torch.float64)
+        mean_tp_d = mean_tp.double()
+        sqrt_lam_tp = torch.rand(
+            batch_size, variable.dof(), variable.dof(), dtype=torch.float64
+        )
+        lam_tp_d = sqrt_lam_tp @ sqrt_lam_tp.transpose(-1, -2) + lam_tp.double()
+        gaussian_d = th.retract_gaussian(variable_d, mean_tp_d, lam_tp_d)
+
+        jac = []
+        variable_d.exp_map(mean_tp_d, jacobians=jac)
+        inv_jac = torch.inverse(jac[0])
+        expected_lam = inv_jac.transpose(-1, -2) @ lam_tp_d @ inv_jac
+        assert torch.allclose(gaussian_d.precision, expected_lam)
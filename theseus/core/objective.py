@@ -4,7 +4,7 @@
 # LICENSE file in the root directory of this source tree.
 import itertools
 import warnings
-from collections import OrderedDict
+from collections import defaultdict
 from typing import (
     Any,
     Callable,
@@ -13,7 +13,7 @@ from typing import (
     List,
     Optional,
     Protocol,
-    Sequence,
+    Set,
     Tuple,
     Union,
 )
@@ -34,8 +34,14 @@ class ErrorMetric(Protocol):
         pass
 
 
+# Computed as a batched dot product, so that squaring and reducing happen in a single
+# kernel, without allocating a temporary for the squared errors
+def _batched_squared_norm(error_vector: torch.Tensor) -> torch.Tensor:
+    return torch.einsum("bi,bi->b", error_vector, error_vector)
+
+
 def error_squared_norm_fn(error_vector: torch.Tensor) -> torch.Tensor:
-    return (error_vector**2).sum(dim=1) / 2
+    return _batched_squared_norm(error_vector) / 2
 
 
 # If dtype is None, uses torch.get_default_dtype()
@@ -70,34 +76,37 @@ class Objective:
         __allow_mixed_optim_aux_vars__: bool = False,  # experimental
     ):
         # maps variable names to the variable objects
-        self.optim_vars: OrderedDict[str, Manifold] = OrderedDict()
+        self.optim_vars: Dict[str, Manifold] = {}
 
         # maps variable names to variables objects, for optimization variables
         # that were registered when adding cost weights.
-        self.cost_weight_optim_vars: OrderedDict[str, Manifold] = OrderedDict()
+        self.cost_weight_optim_vars: Dict[str, Manifold] = {}
 
         # maps aux. variable names to the container objects
-        self.aux_vars: OrderedDict[str, Variable] = OrderedDict()
+        self.aux_vars: Dict[str, Variable] = {}
 
         # maps variable name to variable, for any kind of variable added
-        self._all_variables: OrderedDict[str, Variable] = OrderedDict()
+        self._all_variables: Dict[str, Variable] = {}
 
         # maps cost function names to the cost function objects
-        self.cost_functions: OrderedDict[str, CostFunction] = OrderedDict()
+        self.cost_functions: Dict[str, CostFunction] = {}
 
         # maps cost weights to the cost functions that use them
         # this is used when deleting cost function to check if the cost weight
         # variables can be deleted as well (when no other function uses them)
-        self.cost_functions_for_weights: Dict[CostWeight, List[CostFunction]] = {}
+        self.cost_functions_for_weights: Dict[
+            CostWeight, List[CostFunction]
+        ] = defaultdict(list)
 
         # ---- The following two methods are used just to get info from
         # ---- the objective, they don't affect the optimization logic.
-        # a map from optimization variables to list of theseus functions it's
-        # connected to
-        self.functions_for_optim_vars: Dict[Manifold, List[TheseusFunction]] = {}
+        # a map from optimization variables to the theseus functions it's
+        # connected to. The inner dicts are used as insertion-ordered sets, so that
+        # functions can be removed in constant time when erasing.
+        self.functions_for_optim_vars: Dict[Manifold, Dict[TheseusFunction, None]] = {}
 
-        # a map from all aux. variables to list of theseus functions it's connected to
-        self.functions_for_aux_vars: Dict[Variable, List[TheseusFunction]] = {}
+        # a map from all aux. variables to the theseus functions it's connected to
+        self.functions_for_aux_vars: Dict[Variable, Dict[TheseusFunction, None]] = {}
 
         self._batch_size: Optional[int] = None
 
@@ -110,6 +119,11 @@ class Objective:
         # objective structure might break optimizer initialization).
         self.current_version = 0
 
+        # caches the value of `dim()`, which only changes when the objective's
+        # structure changes (i.e., it's valid as long as `current_version` matches)
+        self._dim_cache: Optional[int] = None
+        self._dim_cache_version = -1
+
         # ---- Callbacks for vectorization ---- #
         # This gets replaced when cost function vectorization is used.
         #
@@ -138,8 +152,10 @@ class Objective:
         self._retract_method = Objective._retract_base
 
         # Keeps track of how many variable updates have been made to check
-        # if vectorization should be updated
-        self._num_updates_variables: Dict[str, int] = {}
+        # if vectorization should be updated. The counters are stored in the order
+        # of _all_variables, which can only change when the objective version changes
+        self._num_updates_variables: List[int] = []
+        self._num_updates_version = -1
 
         self._last_vectorization_has_grad = False
 
@@ -153,6 +169,10 @@ class Objective:
 
         self._allow_mixed_optim_aux_vars = __allow_mixed_optim_aux_vars__
 
+        # Names for which update() has already warned, so that repeated updates
+        # in a loop don't go through the warnings machinery every time
+        self._warned_var_names: Set[str] = set()
+
     def _add_function_variables(
         self,
         function: TheseusFunction,
@@ -171,39 +191,46 @@ class Objective:
             self_vars_of_this_type = self.aux_vars  # type: ignore
 
         for variable in function_vars:
-            # Check that variables have name and correct dtype
-            if variable.name is None:
+            name = variable.name
+            # Check that variables have name and correct dtype. The dtype is checked
+            # even for known variables, since it might have changed after they
+            # were added (e.g., via `variable.to()`)
+            if name is None:
                 raise ValueError(
                     f"Variables added to an objective must be named, but "
                     f"{function.name} has an unnamed variable."
                 )
             if variable.dtype != self.dtype:
                 raise ValueError(
-                    f"Tried to add variable {variable.name} with dtype "
+                    f"Tried to add variable {name} with dtype "
                     f"{variable.dtype} but objective's dtype is {self.dtype}."
                 )
-            # Check that names are unique
-            if variable.name in self._all_variables:
-                if variable is not self._all_variables[variable.name]:
-                    raise ValueError(
-                        f"Two different variable objects with the "
-                        f"same name ({variable.name}) are not allowed "
-                        "in the same objective."
-                    )
-            else:
-                self._all_variables[variable.name] = variable
+            existing_variable = self._all_variables.get(name)
+            if existing_variable is None:
+                self._all_variables[name] = variable
                 assert variable not in self_var_to_fn_map
-                self_var_to_fn_map[variable] = []
+                self_var_to_fn_map[variable] = {function: None}
+            elif existing_variable is not variable:
+                # Check that names are unique
+                raise ValueError(
+                    f"Two different variable objects with the "
+                    f"same name ({name}) are not allowed "
+                    "in the same objective."
+                )
+            else:
+                connected_fns = self_var_to_fn_map.get(variable)
+                if connected_fns is None:
+                    # The variable is known, but not connected to any function of
+                    # this type. This happens if it was previously added with the
+                    # other type (optim/aux), or if all its functions were erased
+                    # (`_all_variables` is not pruned on erase)
+                    self_var_to_fn_map[variable] = {function: None}
+                else:
+                    connected_fns[function] = None
 
             # add to either self.optim_vars,
             # self.cost_weight_optim_vars or self.aux_vars
-            self_vars_of_this_type[variable.name] = variable
-
-            if self._allow_mixed_optim_aux_vars and variable not in self_var_to_fn_map:
-                self_var_to_fn_map[variable] = []
-
-            # add to list of functions connected to this variable
-            self_var_to_fn_map[variable].append(function)
+            self_vars_of_this_type[name] = variable
 
     def add(self, cost_function: CostFunction):
         """Adds a cost function to the objective.
@@ -257,20 +284,20 @@ class Objective:
         # adds information about the auxiliary variables in this cost function
         self._add_function_variables(cost_function, optim_vars=False)
 
-        if cost_function.weight not in self.cost_functions_for_weights:
+        cost_weight = cost_function.weight
+        cost_fns_for_weight = self.cost_functions_for_weights[cost_weight]
+        if not cost_fns_for_weight:
             # ----- Book-keeping for the cost weight ------- #
             # adds information about the variables in this cost function's weight
             self._add_function_variables(
-                cost_function.weight, optim_vars=True, is_cost_weight=True
+                cost_weight, optim_vars=True, is_cost_weight=True
             )
             # adds information about the auxiliary variables in this cost function's weight
             self._add_function_variables(
-                cost_function.weight, optim_vars=False, is_cost_weight=True
+                cost_weight, optim_vars=False, is_cost_weight=True
             )
 
-            self.cost_functions_for_weights[cost_function.weight] = []
-
-            if cost_function.weight.num_optim_vars() > 0:
+            if cost_weight.num_optim_vars() > 0:
                 raise RuntimeError(
                     f"The cost weight associated to {cost_function.name} receives one "
                     "or more optimization variables. Differentiating cost "
@@ -281,31 +308,22 @@ class Objective:
                     "auxiliary variables."
                 )
 
-        self.cost_functions_for_weights[cost_function.weight].append(cost_function)
+        cost_fns_for_weight.append(cost_function)
 
-        optim_vars_names = [
-            var.name
-            for var in itertools.chain(
-                cost_function.optim_vars, cost_function.weight.optim_vars
-            )
-        ]
-        aux_vars_names = [
-            var.name
-            for var in itertools.chain(
-                cost_function.aux_vars, cost_function.weight.aux_vars
-            )
-        ]
         if not self._allow_mixed_optim_aux_vars:
-            dual_var_err_msg = (
-                "Objective does not support a variable being both "
-                + "an optimization variable and an auxiliary variable."
-            )
-            for optim_name in optim_vars_names:
-                if self.has_aux_var(optim_name):
-                    raise ValueError(dual_var_err_msg)
-            for aux_name in aux_vars_names:
-                if self.has_optim_var(aux_name):
-                    raise ValueError(dual_var_err_msg)
+            # the weight cannot have optimization variables (checked above)
+            optim_vars_names = {var.name for var in cost_function.optim_vars}
+            aux_vars_names = {var.name for var in cost_function.aux_vars}
+            aux_vars_names.update(var.name for var in cost_function.weight.aux_vars)
+            # dict key views support set operations directly, so no copies needed
+            if not (
+                self.aux_vars.keys().isdisjoint(optim_vars_names)
+                and self.optim_vars.keys().isdisjoint(aux_vars_names)
+            ):
+                raise ValueError(
+                    "Objective does not support a variable being both "
+                    + "an optimization variable and an auxiliary variable."
+                )
 
     def get_cost_function(self, name: str) -> CostFunction:
         """Returns a reference to the cost function with the given name.
@@ -403,11 +421,16 @@ class Objective:
             self_var_to_fn_map = self.functions_for_aux_vars  # type: ignore
 
         for variable in fn_var_list:
-            cost_fn_idx = self_var_to_fn_map[variable].index(function)
-            # remove function from the variable's list of connected cost functions
-            del self_var_to_fn_map[variable][cost_fn_idx]
+            connected_fns = self_var_to_fn_map.get(variable)
+            if connected_fns is None:
+                # already removed, the variable appears more than once in the function
+                continue
+            # remove function from the variable's connected cost functions
+            # (might be already removed if the variable appears more than once in
+            # the function, but is still connected to other functions)
+            connected_fns.pop(function, None)
             # if the variable has no other functions, remove it also
-            if not self_var_to_fn_map[variable]:
+            if not connected_fns:
                 del self_var_to_fn_map[variable]
                 del self_vars_of_this_type[variable.name]
 
@@ -430,14 +453,16 @@ class Objective:
             self._erase_function_variables(cost_function, optim_vars=False)
 
             # delete cost function from list of cost functions connected to its weight
+            # (order is irrelevant, so swap with the last element and pop)
             cost_weight = cost_function.weight
-            cost_fn_idx = self.cost_functions_for_weights[cost_weight].index(
-                cost_function
-            )
-            del self.cost_functions_for_weights[cost_weight][cost_fn_idx]
+            cost_fns_for_weight = self.cost_functions_for_weights[cost_weight]
+            last_cost_fn = cost_fns_for_weight.pop()
+            if last_cost_fn is not cost_function:
+                cost_fn_idx = cost_fns_for_weight.index(cost_function)
+                cost_fns_for_weight[cost_fn_idx] = last_cost_fn
 
             # No more cost functions associated to this weight, so can also delete
-            if len(self.cost_functions_for_weights[cost_weight]) == 0:
+            if not cost_fns_for_weight:
                 # erase its variables (if needed)
                 self._erase_function_variables(
                     cost_weight, optim_vars=True, is_cost_weight=True
@@ -457,8 +482,8 @@ class Objective:
     @staticmethod
     def _get_functions_connected_to_var(
         variable: Union[str, Variable],
-        objectives_var_container_dict: "OrderedDict[str, Variable]",
-        var_to_cost_fn_map: Dict[Variable, List[TheseusFunction]],
+        objectives_var_container_dict: Dict[str, Variable],
+        var_to_cost_fn_map: Dict[Variable, Dict[TheseusFunction, None]],
         variable_type: str,
     ) -> List[TheseusFunction]:
         if isinstance(variable, str):
@@ -471,7 +496,7 @@ class Objective:
             raise ValueError(
                 f"{variable_type} {variable.name} is not in the objective."
             )
-        return var_to_cost_fn_map[variable]
+        return list(var_to_cost_fn_map[variable])
 
     def get_functions_connected_to_optim_var(
         self, variable: Union[Manifold, str]
@@ -518,9 +543,13 @@ class Objective:
         Returns:
             int: the error dimension.
         """
+        if self._dim_cache_version == self.current_version:
+            return self._dim_cache
         err_dim = 0
         for cost_function in self.cost_functions.values():
             err_dim += cost_function.dim()
+        self._dim_cache = err_dim
+        self._dim_cache_version = self.current_version
         return err_dim
 
     def size(self) -> Tuple[int, int]:
@@ -581,15 +610,44 @@ class Objective:
                 concatenation of all cost functions error vectors. The order corresponds
                 to the order in which cost functions were added to the objective.
         """
-        old_tensors = {}
+        return self._eval_with_input_tensors(
+            self._compute_error_vector, input_tensors, also_update
+        )
+
+    # Evaluates `eval_fn()` after updating the objective with the given input tensors.
+    # If `also_update` is False, the variables are reverted to their old tensors after
+    # evaluation.
+    def _eval_with_input_tensors(
+        self,
+        eval_fn: Callable[[], torch.Tensor],
+        input_tensors: Optional[Dict[str, torch.Tensor]],
+        also_update: bool,
+    ) -> torch.Tensor:
+        old_tensors: Optional[Dict[str, torch.Tensor]] = None
         if input_tensors is not None:
             if not also_update:
-                for var in self.optim_vars:
-                    old_tensors[var] = self.optim_vars[var].tensor
+                # Only the variables referenced by the input need to be reverted
+                old_tensors = {}
+                for name in input_tensors:
+                    if name in self.optim_vars:
+                        old_tensors[name] = self.optim_vars[name].tensor
+                    elif name in self.aux_vars:
+                        old_tensors[name] = self.aux_vars[name].tensor
             # Update vectorization only if the input tensors will be used for a
             # persistent update.
             self.update(input_tensors=input_tensors, _update_vectorization=also_update)
 
+        result = eval_fn()
+
+        if old_tensors is not None:
+            # This line reverts back to the old tensors if a persistent update wasn't
+            # required (i.e., `also_update is False`).
+            # In this case, we pass _update_vectorization=False because
+            # vectorization wasn't updated in the first call to `update()`.
+            self.update(old_tensors, _update_vectorization=False)
+        return result
+
+    def _compute_error_vector(self) -> torch.Tensor:
         # Current behavior when vectorization is on, is to always compute the error.
         # One could potentially optimize by only recompute when `input_tensors`` is
         # not None, and serving from the jacobians cache. However, when robust cost
@@ -597,17 +655,17 @@ class Objective:
         # so we are currently avoiding this optimization. Optimizers also compute error
         # by passing `input_tensors`, so for optimizers the current version should be
         # good enough.
-        error_vector = torch.cat(
-            [cf.weighted_error() for cf in self._get_error_iter()], dim=1
-        )
-
-        if input_tensors is not None and not also_update:
-            # This line reverts back to the old tensors if a persistent update wasn't
-            # required (i.e., `also_update is False`).
-            # In this case, we pass _update_vectorization=False because
-            # vectorization wasn't updated in the first call to `update()`.
-            self.update(old_tensors, _update_vectorization=False)
-        return error_vector
+        return torch.cat([cf.weighted_error() for cf in self._get_error_iter()], dim=1)
+
+    # Same as `error_squared_norm_fn(self._compute_error_vector())`, but reduces
+    # the squared norm of each cost function, without concatenating the error vector.
+    # Stacking (rather than summing) the per-cost squared norms keeps the failure
+    # behavior of `torch.cat`, for empty objectives and mismatched batch sizes
+    def _compute_error_squared_norm(self) -> torch.Tensor:
+        squared_norms = [
+            _batched_squared_norm(cf.weighted_error()) for cf in self._get_error_iter()
+        ]
+        return torch.stack(squared_norms).sum(dim=0) / 2
 
     def error_metric(
         self,
@@ -633,10 +691,46 @@ class Objective:
             torch.Tensor: a tensor of shape (batch_size,) with the scalar value of
                 the objective function.
         """
-        return self._error_metric_fn(
-            self.error(input_tensors=input_tensors, also_update=also_update)
+        if self._error_metric_fn is not error_squared_norm_fn:
+            return self._error_metric_fn(
+                self.error(input_tensors=input_tensors, also_update=also_update)
+            )
+        # For the default metric, avoid concatenating the error vector
+        return self._eval_with_input_tensors(
+            self._compute_error_squared_norm, input_tensors, also_update
         )
 
+    def error_and_metric(
+        self,
+        input_tensors: Optional[Dict[str, torch.Tensor]] = None,
+        also_update: bool = False,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Evaluates both the error vector and its aggregated scalar objective.
+
+        This is equivalent to calling :meth:`error` and :meth:`error_metric`, but
+        the cost functions are only evaluated once.
+
+        Args:
+            input_tensors (Dict[str, torch.Tensor], optional): if given, it must be a
+                dictionary mapping variable names to tensors; if a variable with the
+                given name is registered in the objective, its tensor will be replaced
+                with the one in the dictionary (possibly permanently, depending on the
+                value of ``also_update``). Defaults to ``None``, in which case the error
+                is evaluated using the current tensors stored in all registered
+                variables.
+            also_update (bool, optional): if ``True``, and ``input_tensors`` is given,
+                the modified variables are permanently updated with the given tensors.
+                Defaults to ``False``, in which case the variables are reverted to the
+                previous tensors after the error is evaluated.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: the error vector, of shape
+                (batch_size x error_dim), and the objective value, of shape
+                (batch_size,), in that order.
+        """
+        error_vector = self.error(input_tensors=input_tensors, also_update=also_update)
+        return error_vector, self._error_metric_fn(error_vector)
+
     def copy(self) -> "Objective":
         """Creates a new copy of this objective.
 
@@ -670,34 +764,39 @@ class Objective:
         # Handle case where a variable is copied in 2+ cost functions or cost weights,
         # since only a single copy should be maintained by objective
         for cost_function in new_cost_functions:
-            # CostFunction
-            for i, var in enumerate(cost_function.optim_vars):
-                if new_objective.has_optim_var(var.name):
-                    cost_function.set_optim_var_at(
-                        i, new_objective.optim_vars[var.name]
-                    )
-            for i, aux_var in enumerate(cost_function.aux_vars):
-                if new_objective.has_aux_var(aux_var.name):
-                    cost_function.set_aux_var_at(
-                        i, new_objective.aux_vars[aux_var.name]
-                    )
-            # CostWeight
-            for i, var in enumerate(cost_function.weight.optim_vars):
-                if var.name in new_objective.cost_weight_optim_vars:
-                    cost_function.weight.set_optim_var_at(
-                        i, new_objective.cost_weight_optim_vars[var.name]
-                    )
-            for i, aux_var in enumerate(cost_function.weight.aux_vars):
-                if new_objective.has_aux_var(aux_var.name):
-                    cost_function.weight.set_aux_var_at(
-                        i, new_objective.aux_vars[aux_var.name]
-                    )
+            Objective._replace_with_registered_vars(
+                cost_function, new_objective.optim_vars, new_objective.aux_vars
+            )
+            Objective._replace_with_registered_vars(
+                cost_function.weight,
+                new_objective.cost_weight_optim_vars,
+                new_objective.aux_vars,
+            )
             new_objective.add(cost_function)
         return new_objective
 
+    # Replaces any variables in the function by the variables with the same name
+    # in the given containers, if present
+    @staticmethod
+    def _replace_with_registered_vars(
+        function: TheseusFunction,
+        registered_optim_vars: Dict[str, Manifold],
+        registered_aux_vars: Dict[str, Variable],
+    ):
+        for i, var in enumerate(function.optim_vars):
+            registered_var = registered_optim_vars.get(var.name)
+            if registered_var is not None and registered_var is not var:
+                function.set_optim_var_at(i, registered_var)
+        for i, aux_var in enumerate(function.aux_vars):
+            registered_aux_var = registered_aux_vars.get(aux_var.name)
+            if registered_aux_var is not None and registered_aux_var is not aux_var:
+                function.set_aux_var_at(i, registered_aux_var)
+
     def __deepcopy__(self, memo):
-        if id(self) in memo:
-            return memo[id(self)]
+        if memo:
+            the_copy = memo.get(id(self))
+            if the_copy is not None:
+                return the_copy
         the_copy = self.copy()
         memo[id(self)] = the_copy
         return the_copy
@@ -705,20 +804,20 @@ class Objective:
     def _resolve_batch_size(self):
         self._batch_size = None
 
-        def _get_batch_size(batch_sizes: Sequence[int]) -> int:
-            unique_batch_sizes = set(batch_sizes)
-            if len(unique_batch_sizes) == 1:
-                return batch_sizes[0]
-            if len(unique_batch_sizes) == 2:
-                min_bs = min(unique_batch_sizes)
-                max_bs = max(unique_batch_sizes)
-                if min_bs == 1:
-                    return max_bs
+        # single pass over all variables, failing on the first batch size that
+        # cannot be broadcast with the ones seen so far
+        batch_size: Optional[int] = None
+        for v in itertools.chain(self.optim_vars.values(), self.aux_vars.values()):
+            var_batch_size = v.tensor.shape[0]
+            if batch_size is None:
+                batch_size = var_batch_size
+            elif var_batch_size != batch_size:
+                if min(var_batch_size, batch_size) != 1:
+                    raise ValueError("Provided tensors must be broadcastable.")
+                batch_size = max(var_batch_size, batch_size)
+        if batch_size is None:
             raise ValueError("Provided tensors must be broadcastable.")
-
-        batch_sizes = [v.tensor.shape[0] for v in self.optim_vars.values()]
-        batch_sizes.extend([v.tensor.shape[0] for v in self.aux_vars.values()])
-        self._batch_size = _get_batch_size(batch_sizes)
+        self._batch_size = batch_size
 
     # batch_ignore_mask is a boolean list where batch_ignore_mask[i] = 1 means
     # for any variable v, v[i] will *not* be updated. Shape must be equal to the
@@ -772,25 +871,25 @@ class Objective:
                     f"one ore more data dimensions, but tensor.ndim={tensor.ndim} for "
                     f"tensor with name {var_name}."
                 )
-            if var_name in self.optim_vars:
-                self.optim_vars[var_name].update(
-                    tensor, batch_ignore_mask=batch_ignore_mask
-                )
-            elif var_name in self.aux_vars:
-                self.aux_vars[var_name].update(
-                    tensor, batch_ignore_mask=batch_ignore_mask
-                )
+            var = self.optim_vars.get(var_name)
+            if var is None:
+                var = self.aux_vars.get(var_name)
+            if var is not None:
+                var.update(tensor, batch_ignore_mask=batch_ignore_mask)
             elif var_name in self.cost_weight_optim_vars:
                 self.cost_weight_optim_vars[var_name].update(
                     tensor, batch_ignore_mask=batch_ignore_mask
                 )
-                warnings.warn(
-                    "Updated a variable declared as optimization, but it is "
-                    "only associated to cost weights and not to any cost functions. "
-                    "Theseus optimizers will only update optimization variables "
-                    "that are associated to one or more cost functions."
-                )
-            else:
+                if var_name not in self._warned_var_names:
+                    self._warned_var_names.add(var_name)
+                    warnings.warn(
+                        "Updated a variable declared as optimization, but it is "
+                        "only associated to cost weights and not to any cost "
+                        "functions. Theseus optimizers will only update optimization "
+                        "variables that are associated to one or more cost functions."
+                    )
+            elif var_name not in self._warned_var_names:
+                self._warned_var_names.add(var_name)
                 warnings.warn(
                     f"Attempted to update a tensor with name {var_name}, "
                     "which is not associated to any variable in the objective."
@@ -802,15 +901,19 @@ class Objective:
             self.update_vectorization_if_needed()
 
     def _vectorization_needs_update(self):
-        num_updates = {name: v._num_updates for name, v in self._all_variables.items()}
+        num_updates = [v._num_updates for v in self._all_variables.values()]
         needs = False
-        if num_updates != self._num_updates_variables:
+        if (
+            self.current_version != self._num_updates_version
+            or num_updates != self._num_updates_variables
+        ):
             self._num_updates_variables = num_updates
+            self._num_updates_version = self.current_version
             needs = True
 
-        if torch.is_grad_enabled():
-            if not self._last_vectorization_has_grad:
-                needs = True
+        # only query the grad mode when the last run could have been without grad
+        if not needs and not self._last_vectorization_has_grad:
+            needs = torch.is_grad_enabled()
         return needs
 
     def update_vectorization_if_needed(self):
@@ -820,19 +923,20 @@ class Objective:
             self._vectorization_run()
             self._last_vectorization_has_grad = torch.is_grad_enabled()
 
-    # iterates over cost functions
+    # iterates over a snapshot of the cost functions, so that cost functions
+    # can be erased while iterating
     def __iter__(self):
-        return iter([cf for cf in self.cost_functions.values()])
+        return iter(list(self.cost_functions.values()))
 
     def _get_error_iter_base(self) -> Iterable:
-        return iter(cf for cf in self.cost_functions.values())
+        return iter(self.cost_functions.values())
 
     def _get_jacobians_iter(self) -> Iterable:
         self.update_vectorization_if_needed()
         if self.vectorized:
-            return iter(cf for cf in self._vectorized_jacobians_iter)
+            return iter(self._vectorized_jacobians_iter)
         # No vectorization is used, just serve from cost functions
-        return iter(cf for cf in self.cost_functions.values())
+        return iter(self.cost_functions.values())
 
     def to(self, *args, **kwargs):
         """Applies torch.Tensor.to() to all cost functions in the objective."""
@@ -851,14 +955,14 @@ class Objective:
         ignore_mask: Optional[torch.Tensor] = None,
         force_update: bool = False,
     ):
-        var_idx = 0
-        for var in ordering:
-            new_var = var.retract(delta[:, var_idx : var_idx + var.dof()])
+        ordering = list(ordering)
+        var_deltas = torch.split(delta, [var.dof() for var in ordering], dim=1)
+        for var, var_delta in zip(ordering, var_deltas):
+            new_var = var.retract(var_delta)
             if ignore_mask is None or force_update:
                 var.update(new_var.tensor)
             else:
                 var.update(new_var.tensor, batch_ignore_mask=ignore_mask)
-            var_idx += var.dof()
 
     def retract_vars_sequence(
         self,
@@ -923,6 +1027,7 @@ class Objective:
         self._retract_method = vectorized_retract_fn
         self._get_error_iter = error_iter_fn
         self._vectorized = True
+        self._check_vectorization_state()
 
     # Making public, since this should be a safe operation
     def disable_vectorization(self):
@@ -932,9 +1037,11 @@ class Objective:
         self._retract_method = Objective._retract_base
         self._get_error_iter = self._get_error_iter_base
         self._vectorized = False
+        self._check_vectorization_state()
 
-    @property
-    def vectorized(self):
+    # The vectorization attributes are only changed together, by the two methods
+    # above, so checking their consistency there is enough
+    def _check_vectorization_state(self):
         assert (
             (not self._vectorized)
             == (self._vectorized_jacobians_iter is None)
@@ -943,4 +1050,7 @@ class Objective:
             == (self._get_error_iter == self._get_error_iter_base)
             == (self._retract_method == Objective._retract_base)
         )
+
+    @property
+    def vectorized(self):
         return self._vectorized
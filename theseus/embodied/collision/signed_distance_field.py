@@ -207,16 +207,23 @@ class SignedDistanceField2D:
         def gather_sdf(r_, c_):
             return gather_from_rows_cols(self.sdf_data.tensor, r_, c_)
 
+        # The four cell corners are shared by the distance and jacobian computations,
+        # so gather each of them only once
+        sdf_ll = gather_sdf(lri, lci)
+        sdf_hl = gather_sdf(hri, lci)
+        sdf_lh = gather_sdf(lri, hci)
+        sdf_hh = gather_sdf(hri, hci)
+
         # Compute the distance
         hrdiff = hr - rows
         hcdiff = hc - cols
         lrdiff = rows - lr
         lcdiff = cols - lc
         dist = (
-            hrdiff * hcdiff * gather_sdf(lri, lci)
-            + lrdiff * hcdiff * gather_sdf(hri, lci)
-            + hrdiff * lcdiff * gather_sdf(lri, hci)
-            + lrdiff * lcdiff * gather_sdf(hri, hci)
+            hrdiff * hcdiff * sdf_ll
+            + lrdiff * hcdiff * sdf_hl
+            + hrdiff * lcdiff * sdf_lh
+            + lrdiff * lcdiff * sdf_hh
         )
         dist[out_of_bounds_idx] = self.sdf_boundary_value
 
@@ -228,14 +235,8 @@ class SignedDistanceField2D:
             else self.cell_size.tensor.unsqueeze(-1)
         )
 
-        jac1 = (
-            hrdiff * (gather_sdf(lri, hci) - gather_sdf(lri, lci))
-            + lrdiff * (gather_sdf(hri, hci) - gather_sdf(hri, lci))
-        ) / cell_size
-        jac2 = (
-            hcdiff * (gather_sdf(hri, lci) - gather_sdf(lri, lci))
-            + lcdiff * (gather_sdf(hri, hci) - gather_sdf(lri, hci))
-        ) / cell_size
+        jac1 = (hrdiff * (sdf_lh - sdf_ll) + lrdiff * (sdf_hh - sdf_hl)) / cell_size
+        jac2 = (hcdiff * (sdf_hl - sdf_ll) + lcdiff * (sdf_hh - sdf_lh)) / cell_size
         jac1[out_of_bounds_idx] = 0
         jac2[out_of_bounds_idx] = 0
         return dist, torch.stack([jac1, jac2], dim=2)
@@ -164,7 +164,12 @@ def retract_gaussian(
 
     jac: List[torch.Tensor] = []
     variable.exp_map(mean_tp, jacobians=jac)
-    inv_jac = torch.inverse(jac[0])
-    precision = torch.bmm(torch.bmm(inv_jac.transpose(-1, -2), precision_tp), inv_jac)
+    # precision = J^-T @ precision_tp @ J^-1, computed with two solves against J^T
+    # instead of explicitly inverting the jacobian
+    jac_t = jac[0].transpose(-1, -2)
+    precision = torch.linalg.solve(
+        jac_t,
+        torch.linalg.solve(jac_t, precision_tp.transpose(-1, -2)).transpose(-1, -2),
+    )
 
     return ManifoldGaussian(mean=[mean], precision=precision)
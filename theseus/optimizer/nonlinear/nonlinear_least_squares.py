@@ -106,7 +106,7 @@ class NonlinearLeastSquares(NonlinearOptimizer, abc.ABC):
         _last_implicit_diff_step: bool = False,
         **kwargs,
     ) -> int:
-        steps_tensor: torch.Tensor = None  # type: ignore
+        step_size: Optional[float] = None
         converged_indices = torch.zeros_like(info.last_err).bool()
         iters_done = 0
         it_ = 0
@@ -154,19 +154,20 @@ class NonlinearLeastSquares(NonlinearOptimizer, abc.ABC):
                 # 1 for the truncated steps, resulting in scaled gradients, but
                 # possibly better solution.
                 if not kwargs.get("__keep_final_step_size__", False):
-                    steps_tensor = torch.ones_like(delta)
+                    step_size = 1.0
                 force_update = True
             else:
                 force_update = False
 
-            with torch.no_grad():
-                if steps_tensor is None:
-                    steps_tensor = torch.ones_like(delta) * self.params.step_size
+            # The step size is a constant scalar, so there is no need to build a
+            # tensor of steps with the shape of delta at every iteration
+            if step_size is None:
+                step_size = self.params.step_size
 
             # For now, step size is combined with delta. If we add more sophisticated
             # line search, will probably need to pass it separately, or compute inside.
             err, all_rejected = self._step(
-                delta * steps_tensor,
+                delta * step_size,
                 info.last_err,
                 converged_indices,
                 force_update,
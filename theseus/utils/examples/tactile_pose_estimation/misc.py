@@ -64,7 +64,7 @@ class TactilePushingDataset:
         print(f"Dataset for mode '{data_mode}' has size {self.dataset_size}.")
 
         # obj_poses is shape (num_episodes, episode_length, 3)
-        self.time_steps = np.minimum(max_steps, self.obj_poses.shape[1])
+        self.time_steps = min(max_steps, self.obj_poses.shape[1])
         self.batch_size = batch_size
         self.num_batches = (self.dataset_size - 1) // self.batch_size + 1
 
@@ -158,20 +158,20 @@ class TactilePushingDataset:
             sdf_from_file = json.load(f)
         sdf_data_vec = sdf_from_file["grid_data"]
 
-        sdf_data_mat = np.zeros(
-            (sdf_from_file["grid_size_y"], sdf_from_file["grid_size_x"])
+        # Convert row by row and transfer the whole grid to the device in one copy
+        num_rows, num_cols = sdf_from_file["grid_size_y"], sdf_from_file["grid_size_x"]
+        sdf_data_mat = np.array(
+            [row[:num_cols] for row in sdf_data_vec[:num_rows]], dtype=np.float64
         )
-        for i in range(sdf_data_mat.shape[0]):
-            for j in range(sdf_data_mat.shape[1]):
-                sdf_data_mat[i, j] = sdf_data_vec[i][j]
 
-        sdf_data_tensor = torch.tensor(sdf_data_mat, device=device).unsqueeze(0)
-        cell_size = torch.tensor([sdf_from_file["grid_res"]], device=device).unsqueeze(
-            0
-        )
+        sdf_data_tensor = torch.from_numpy(sdf_data_mat).to(device).unsqueeze(0)
+        cell_size = torch.tensor(
+            [sdf_from_file["grid_res"]], device=device, dtype=torch.double
+        ).unsqueeze(0)
         origin = torch.tensor(
             [sdf_from_file["grid_origin_x"], sdf_from_file["grid_origin_y"]],
             device=device,
+            dtype=torch.double,
         ).unsqueeze(0)
 
         return sdf_data_tensor, cell_size, origin
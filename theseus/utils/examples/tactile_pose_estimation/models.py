@@ -2,7 +2,6 @@ import collections
 import pathlib
 from typing import Dict, List, Optional, Tuple, cast
 
-import numpy as np
 import omegaconf
 import torch
 import torch.nn as nn
@@ -143,7 +142,7 @@ def get_tactile_nn_measurements_inputs(
         meas_model_input_1_list: List[torch.Tensor] = []
         meas_model_input_2_list: List[torch.Tensor] = []
         for i in range(min_win_mf, time_steps):
-            for offset in range(min_win_mf, np.minimum(i, max_win_mf), step_win_mf):
+            for offset in range(min_win_mf, min(i, max_win_mf), step_win_mf):
                 meas_model_input_1_list.append(images_feat_meas[:, i - offset, :])
                 meas_model_input_2_list.append(images_feat_meas[:, i, :])
 
@@ -160,7 +159,7 @@ def get_tactile_nn_measurements_inputs(
         obj_poses = batch["obj_poses"]
         model_measurements = []
         for i in range(min_win_mf, time_steps):
-            for offset in range(min_win_mf, np.minimum(i, max_win_mf), step_win_mf):
+            for offset in range(min_win_mf, min(i, max_win_mf), step_win_mf):
                 eff_pose_1 = th.SE2(x_y_theta=eff_poses[:, i - offset])
                 obj_pose_1 = th.SE2(x_y_theta=obj_poses[:, i - offset])
                 eff_pose_1__obj = obj_pose_1.between(eff_pose_1)
@@ -190,7 +189,7 @@ def get_tactile_nn_measurements_inputs(
     # set MovingFrameBetween measurements from the NN output
     nn_meas_idx = 0
     for i in range(min_win_mf, time_steps):
-        for offset in range(min_win_mf, np.minimum(i, max_win_mf), step_win_mf):
+        for offset in range(min_win_mf, min(i, max_win_mf), step_win_mf):
             meas_xycs_ = torch.stack(
                 [
                     model_measurements[:, nn_meas_idx, 0],
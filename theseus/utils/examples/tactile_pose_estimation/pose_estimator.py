@@ -23,6 +23,7 @@ class TactilePoseEstimator:
         step_size: float = 1.0,
         regularization_w: float = 0.0,
         force_max_iters: bool = False,
+        linear_solver_cls: Type[th.LinearSolver] = th.CholeskyDenseSolver,
     ):
         time_steps = dataset.time_steps
 
@@ -44,27 +45,39 @@ class TactilePoseEstimator:
         #  - nn_measurements: tactile measurement prediction from image features
         #  - sdf_data, sdf_cell_size, sdf_origin: signed distance field data,
         #    cell_size and origin
-        obj_start_pose = th.SE2(name="obj_start_pose")
+        obj_start_pose = th.SE2(name="obj_start_pose", dtype=torch.double)
         self.obj_start_pose = obj_start_pose
 
         motion_captures: List[th.SE2] = []
         for i in range(time_steps):
-            motion_captures.append(th.SE2(name=f"motion_capture_{i}"))
+            motion_captures.append(
+                th.SE2(name=f"motion_capture_{i}", dtype=torch.double)
+            )
         self.motion_captures = motion_captures
 
-        nn_measurements = []
-        for i in range(min_window_moving_frame, time_steps):
-            for offset in range(
+        # Offsets of the moving frame measurements ending at each time step,
+        # shared by the measurements and cost functions created below
+        mf_offsets = [
+            range(
                 min_window_moving_frame,
-                np.minimum(i, max_window_moving_frame),
+                min(i, max_window_moving_frame),
                 step_window_moving_frame,
-            ):
-                nn_measurements.append(th.SE2(name=f"nn_measurement_{i-offset}_{i}"))
+            )
+            for i in range(time_steps)
+        ]
+        nn_measurements = []
+        for i in range(min_window_moving_frame, time_steps):
+            for offset in mf_offsets[i]:
+                nn_measurements.append(
+                    th.SE2(name=f"nn_measurement_{i-offset}_{i}", dtype=torch.double)
+                )
 
         sdf_data = th.Variable(dataset.sdf_data_tensor, name="sdf_data")
         sdf_cell_size = th.Variable(dataset.sdf_cell_size, name="sdf_cell_size")
         sdf_origin = th.Point2(dataset.sdf_origin, name="sdf_origin")
-        eff_radius = th.Variable(torch.zeros(1, 1), name="eff_radius")
+        eff_radius = th.Variable(
+            torch.zeros(1, 1, device=device, dtype=torch.double), name="eff_radius"
+        )
 
         # -------------------------------------------------------------------- #
         # Creating cost weights
@@ -78,16 +91,26 @@ class TactilePoseEstimator:
         #  - motion_capture_weight: diagonal cost weight shared across all end-effector
         #    priors cost functions.
         qsp_weight = th.DiagonalCostWeight(
-            th.Variable(torch.ones(1, 3), name="qsp_weight")
+            th.Variable(
+                torch.ones(1, 3, device=device, dtype=torch.double), name="qsp_weight"
+            )
         )
         mf_between_weight = th.DiagonalCostWeight(
-            th.Variable(torch.ones(1, 3), name="mf_between_weight")
+            th.Variable(
+                torch.ones(1, 3, device=device, dtype=torch.double),
+                name="mf_between_weight",
+            )
         )
         intersect_weight = th.ScaleCostWeight(
-            th.Variable(torch.ones(1, 1), name="intersect_weight")
+            th.Variable(
+                torch.ones(1, 1, device=device, dtype=torch.double),
+                name="intersect_weight",
+            )
         )
         motion_capture_weight = th.DiagonalCostWeight(
-            th.Variable(torch.ones(1, 3), name="mc_weight")
+            th.Variable(
+                torch.ones(1, 3, device=device, dtype=torch.double), name="mc_weight"
+            )
         )
 
         # -------------------------------------------------------------------- #
@@ -109,7 +132,7 @@ class TactilePoseEstimator:
         # cost weights, and their auxiliary variables
         objective = th.Objective()
         nn_meas_idx = 0
-        c_square = (np.sqrt(rectangle_shape[0] ** 2 + rectangle_shape[1] ** 2)) ** 2
+        c_square = rectangle_shape[0] ** 2 + rectangle_shape[1] ** 2
         for i in range(time_steps):
             if i == 0:
                 objective.add(
@@ -134,11 +157,7 @@ class TactilePoseEstimator:
                     )
                 )
             if i >= min_window_moving_frame:
-                for offset in range(
-                    min_window_moving_frame,
-                    np.minimum(i, max_window_moving_frame),
-                    step_window_moving_frame,
-                ):
+                for offset in mf_offsets[i]:
                     objective.add(
                         th.eb.MovingFrameBetween(
                             obj_poses[i - offset],
@@ -177,7 +196,7 @@ class TactilePoseEstimator:
         if regularization_w > 0.0:
             reg_w = th.ScaleCostWeight(np.sqrt(regularization_w))
             reg_w.to(dtype=torch.double)
-            identity_se2 = th.SE2(name="identity")
+            identity_se2 = th.SE2(name="identity", dtype=torch.double)
             for pose_list in [obj_poses, eff_poses]:
                 for pose in pose_list:
                     objective.add(
@@ -191,10 +210,14 @@ class TactilePoseEstimator:
         # -------------------------------------------------------------------- #
         # Wrap the objective and inner-loop optimizer into a `TheseusLayer`.
         # Inner-loop optimizer here is the Levenberg-Marquardt nonlinear optimizer
-        # coupled with a dense linear solver based on Cholesky decomposition.
+        # coupled with a dense linear solver based on Cholesky decomposition by
+        # default. Since cost functions only connect poses within the moving frame
+        # window, the system is sparse, and for long trajectories a sparse solver
+        # (e.g., th.CholmodSparseSolver on CPU, th.LUCudaSparseSolver on GPU) can be
+        # passed via `linear_solver_cls` instead.
         nl_optimizer = optimizer_cls(
             objective,
-            th.CholeskyDenseSolver,
+            linear_solver_cls,
             max_iterations=max_iterations,
             step_size=step_size,
             abs_err_tolerance=0 if force_max_iters else 1e-10,
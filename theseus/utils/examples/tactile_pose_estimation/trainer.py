@@ -99,6 +99,9 @@ class TactilePushingTrainer:
             step_size=cfg.inner_optim.step_size,
             regularization_w=cfg.inner_optim.reg_w,
             force_max_iters=cfg.inner_optim.force_max_iters,
+            linear_solver_cls=getattr(
+                th, cfg.inner_optim.get("linear_solver_cls", "CholeskyDenseSolver")
+            ),
         )
 
         # -------------------------------------------------------------------- #
@@ -2,7 +2,6 @@
 #
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
-import abc
 from typing import Any, Callable, List, Optional, Protocol, Tuple
 
 import torch
@@ -46,9 +45,8 @@ class UnaryOperator(torch.autograd.Function):
     generate_vmap_rule = True
 
     @classmethod
-    @abc.abstractmethod
     def _forward_impl(cls, tensor: torch.Tensor) -> Any:
-        pass
+        raise NotImplementedError
 
     @classmethod
     def forward(cls, *args):
@@ -122,9 +120,8 @@ class BinaryOperator(torch.autograd.Function):
     generate_vmap_rule = True
 
     @classmethod
-    @abc.abstractmethod
     def _forward_impl(cls, input0, input1):
-        pass
+        raise NotImplementedError
 
     @classmethod
     def forward(cls, *args):
@@ -217,9 +214,8 @@ class GradientOperator(torch.autograd.Function):
     generate_vmap_rule = True
 
     @classmethod
-    @abc.abstractmethod
     def _forward_impl(cls, group, tensor, dim_out):
-        pass
+        raise NotImplementedError
 
     @classmethod
     def forward(cls, *args):